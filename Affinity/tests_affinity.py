@@ -1,5 +1,16 @@
+import asyncio
+import logging
+import time
 import requests
+import httpx
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import Any, Dict, Optional, List
 import os
+import sys
+# fastjson.py vive en la raíz del repo, compartido con los scripts de Notion
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from fastjson import loads as json_loads
 from dotenv import load_dotenv
 from rich import print as rprint
 from rich.pretty import Pretty
@@ -7,16 +18,31 @@ from rich.pretty import Pretty
 load_dotenv()
 api_key = os.getenv("BEARER_TOKEN")
 
+# Las respuestas completas solo se vuelcan con logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+# Máximo de peticiones concurrentes contra api.affinity.co
+AFFINITY_CONCURRENCY = 64
+AFFINITY_MAX_RETRIES = 5
+
+# Sesión compartida: reutiliza conexiones TCP/TLS (keep-alive) y reintenta 429/5xx
+SESSION = requests.Session()
+SESSION.headers.update({"Authorization": f"Bearer {api_key}"})
+SESSION.mount("https://", HTTPAdapter(
+    pool_connections=32,
+    pool_maxsize=64,
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504], raise_on_status=False),
+))
+
 
 ## Nested JSON are accesesed with brackets []
 
 
 def who_am_i(): 
     url = "https://api.affinity.co/v2/auth/whoami"
-    headers = {"Authorization": f"Bearer {api_key}"}
-    response = requests.get(url, headers=headers)
-    data = response.json()
-    print(data)
+    response = SESSION.get(url)
+    data = json_loads(response.content)
+    logger.debug("whoami response: %s", data)
 
     return data["user"]
 
@@ -36,26 +62,42 @@ def get_companies():
     query = {
     "limit": "10",
     }
-    headers = {"Authorization": f"Bearer {api_key}"}
-    response = requests.get(url, headers=headers, params=query)
-    data = response.json()
+    response = SESSION.get(url, params=query)
+    data = json_loads(response.content)
     data = data["data"]
-    for company in data: 
-        name = company["name"]
-        id = company["id"]
-        print(f"Company: {name} (ID: {id})")
+    # una sola escritura a stdout en lugar de un print por fila
+    if data:
+        print("\n".join(f"Company: {company['name']} (ID: {company['id']})" for company in data))
     return data
 
 
-def get_company_by_id(company_id): 
-    """Get a specific company by ID."""
+# Nombres ya resueltos, compartidos por get_company_by_id y get_company_by_id_async
+COMPANY_NAMES_MAX = 1024
+_company_names: Dict[Any, str] = {}
+
+def _remember_company_name(company_id, name):
+    # si se llena se descarta el más antiguo (los dict conservan el orden de inserción)
+    if company_id not in _company_names and len(_company_names) >= COMPANY_NAMES_MAX:
+        _company_names.pop(next(iter(_company_names)))
+    _company_names[company_id] = name
+    return name
+
+def _company_name(company_id):
+    if company_id in _company_names:
+        return _company_names[company_id]
+    # Sin fieldIds/fieldTypes la v2 no devuelve field data: solo id, name y dominios,
+    # así que la respuesta ya es mínima y no hace falta pedir campos concretos.
     url = f"https://api.affinity.co/v2/companies/{company_id}"
-    headers = {"Authorization": f"Bearer {api_key}"}
-    response = requests.get(url, headers=headers)
-    data = response.json()
-    name = data["name"]
-    id = data["id"]
-    print(f"Company: {name} (ID: {id})")
+    response = SESSION.get(url)
+    data = json_loads(response.content)
+    return _remember_company_name(company_id, data["name"])
+
+
+def get_company_by_id(company_id): 
+    """Get a specific company by ID. The name is cached per company_id, so repeated lookups skip the API."""
+    # el print queda fuera de la caché para que salga en cada llamada
+    name = _company_name(company_id)
+    print(f"Company: {name} (ID: {company_id})")
     return  name
 
 
@@ -65,53 +107,43 @@ def get_company_fields():
     query = {
     "limit": "5"
     }
-    headers = {"Authorization": f"Bearer {api_key}"}
-    response = requests.get(url, headers=headers, params=query)
+    response = SESSION.get(url, params=query)
 
-    data = response.json()
+    data = json_loads(response.content)
     data = data["data"]
-    for field in data:
-        id = field["id"]
-        name = field["name"]
-        enrichment_source = field["enrichmentSource"]
-        print(f"Field: {name} (ID: {id}) - Enrichment Source: {enrichment_source}")
+    if data:
+        print("\n".join(
+            f"Field: {field['name']} (ID: {field['id']}) - Enrichment Source: {field['enrichmentSource']}"
+            for field in data
+        ))
     return None
 
-def get_company_lists(company_id): 
-    """Get lists associated with a specific company."""
+def get_company_lists(company_id, company_name=None): 
+    """Get lists associated with a specific company. Pass company_name if already known to skip the company lookup."""
     url = f"https://api.affinity.co/v2/companies/{company_id}/lists"
-    headers = {"Authorization": f"Bearer {api_key}"}
-    response = requests.get(url, headers=headers)
-    data = response.json()
+    response = SESSION.get(url)
+    data = json_loads(response.content)
     data = data["data"]
-    name_company = get_company_by_id(company_id)
-    i = 0
-    print(f"Lists in which the company {name_company} is included:")
-    for lst in data:
-        i += 1  
-        id = lst["id"]
-        name = lst["name"]
-        print(f"{i}: {name} (ID: {id})")
+    name_company = company_name or get_company_by_id(company_id)
+    lines = [f"Lists in which the company {name_company} is included:"]
+    lines.extend(f"{i}: {lst['name']} (ID: {lst['id']})" for i, lst in enumerate(data, 1))
+    print("\n".join(lines))
     return None
 
 
-def get_company_list_entries(companyid):
+def get_company_list_entries(companyid, company_name=None):
     """Paginate through the List Entries (AKA rows) for the given Company across all Lists. Each List Entry includes field data for the Company,
-    including list-specific field data. Each List Entry also includes metadata about its creation, i.e., when it was added to the List and by whom."""
+    including list-specific field data. Each List Entry also includes metadata about its creation, i.e., when it was added to the List and by whom.
+    Pass company_name if already known to skip the company lookup."""
 
     url = f"https://api.affinity.co/v2/companies/{companyid}/list-entries"
-    headers = {"Authorization": f"Bearer {api_key}"}
-    response = requests.get(url, headers=headers)
-    data = response.json()
+    response = SESSION.get(url)
+    data = json_loads(response.content)
     data = data["data"]
-    name_company = get_company_by_id(companyid)
-    i = 0
-    print(f"List Entries for the company {name_company}:")
-    for entry in data:
-        i += 1  
-        id = entry["id"]
-        fields = entry["fields"]
-        print(f"{i}: Entry ID: {id} - Fields: {fields}")
+    name_company = company_name or get_company_by_id(companyid)
+    lines = [f"List Entries for the company {name_company}:"]
+    lines.extend(f"{i}: Entry ID: {entry['id']} - Fields: {entry['fields']}" for i, entry in enumerate(data, 1))
+    print("\n".join(lines))
 
     return None 
 
@@ -122,11 +154,10 @@ def get_emails():
     query = {
     "limit": "10",
     }
-    headers = {"Authorization": f"Bearer {api_key}"}
-    response = requests.get(url, headers=headers, params=query)
-    data = response.json()
-    
-    print(data)
+    response = SESSION.get(url, params=query)
+    data = json_loads(response.content)
+    logger.debug("emails response: %s", data)
+    return data
 
 
 
@@ -139,15 +170,12 @@ def get_lists():
     query = {
     "limit": "10",
     }
-    headers = {"Authorization": f"Bearer {api_key}"}
-    response = requests.get(url, headers=headers, params=query)
-    data = response.json()
+    response = SESSION.get(url, params=query)
+    data = json_loads(response.content)
     data = data["data"]
     #print(data)
-    for list in data:
-        name = list["name"]
-        id = list["id"]
-        print(f"List: {name} (ID: {id})")   
+    if data:
+        print("\n".join(f"List: {lst['name']} (ID: {lst['id']})" for lst in data))
 
     return None
 
@@ -155,9 +183,8 @@ def get_lists():
 def get_list_by_id(list_id): 
     """Get a specific list by ID."""
     url = f"https://api.affinity.co/v2/lists/{list_id}"
-    headers = {"Authorization": f"Bearer {api_key}"}
-    response = requests.get(url, headers=headers)
-    data = response.json()
+    response = SESSION.get(url)
+    data = json_loads(response.content)
     name = data["name"]
     content = data["type"]
     print(f"List Name: {name} (Content: {content})")
@@ -166,9 +193,8 @@ def get_list_by_id(list_id):
 def get_list_entries_by_list_id(list_id):
     """Get entries in a specific list by ID."""
     url = f"https://api.affinity.co/v2/lists/{list_id}/list-entries"
-    headers = {"Authorization": f"Bearer {api_key}"}
-    response = requests.get(url, headers=headers)
-    data = response.json()
+    response = SESSION.get(url)
+    data = json_loads(response.content)
     data = data["data"]
     "Data structure example: [{'id': 14355554, 'listId': 51750, 'creatorId': 41826372, 'type': 'company', 'createdAt': '2020-03-28T07:00:00Z', 'entity': {'id': 148821928, 'name': 'LightBee', 'domain': 'lightbeecorp.com', 'domains': ['lightbeecorp.com'], 'isGlobal': True}}, {'id': 14355555, 'listId': 51750, 'creatorId': 41826372, 'type': 'company', 'createdAt': '2020-02-12T08:00:00Z', 'entity': {'id': 224617431, 'name': 'Sateliot', 'domain': 'sateliot.space', 'domains': ['sateliot.space'], 'isGlobal': True}}, {'id': 14355556, 'listId': 51750, 'creatorId': 41826372, 'type': 'company', 'createdAt': '2020-02-12T08:00:00Z'"
     for item in data[:1]:
@@ -181,11 +207,10 @@ def get_list_entries_by_list_id(list_id):
 def get_single_entry_by_entry_id_on_specific_list_by_listid(entry_id, list_id):
     """Get a specific entry by ID within a specific list."""
     url = f"https://api.affinity.co/v2/lists/{list_id}/list-entries/{entry_id}"
-    headers = {"Authorization": f"Bearer {api_key}"}
-    response = requests.get(url, headers=headers)
-    data = response.json()
-    print(data)
-    return None
+    response = SESSION.get(url)
+    data = json_loads(response.content)
+    logger.debug("list entry response: %s", data)
+    return data
 
 import requests
 from typing import Any, Dict, Optional, List
@@ -205,7 +230,7 @@ def _coerce_number(x):
         return x
 
 def _normalize_field(field: Dict[str, Any]) -> Optional[Dict[str, Any]]:
-    v = field.get("value", {})
+    v = field["value"]  # Affinity siempre incluye "value" en cada field
     data = v.get("data")
     if data is None:
         return None  # ignorar nulos
@@ -222,7 +247,7 @@ def _normalize_field(field: Dict[str, Any]) -> Optional[Dict[str, Any]]:
             "country": data.get("country"),
             "continent": data.get("continent"),
         }
-        location_str = ", ".join([p for p in [raw["city"], raw["state"], raw["country"]] if p])
+        location_str = ", ".join(p for p in (raw["city"], raw["state"], raw["country"]) if p)
         data = {"raw": raw, "location_str": location_str}
 
     return {
@@ -245,6 +270,9 @@ def _parse_company_payload(payload: Dict[str, Any]) -> Dict[str, Any]:
     def get_data(fid, default=None):
         return normalized.get(fid, {}).get("data", default)
 
+    # se lee una sola vez y se reutiliza para location y location_str
+    location = get_data("dealroom-location") or {}
+
     summary = {
         "company_urls": {
             "dealroom": get_data("dealroom-url"),
@@ -262,8 +290,8 @@ def _parse_company_payload(payload: Dict[str, Any]) -> Dict[str, Any]:
             "last_eur": get_data("dealroom-last-funding-amount"),
             "total_eur": get_data("dealroom-total-funding-amount"),
         },
-        "location": (get_data("dealroom-location") or {}).get("raw"),
-        "location_str": (get_data("dealroom-location") or {}).get("location_str"),
+        "location": location.get("raw"),
+        "location_str": location.get("location_str"),
     }
 
     return {
@@ -271,7 +299,43 @@ def _parse_company_payload(payload: Dict[str, Any]) -> Dict[str, Any]:
         "summary": summary,               # lo importante
     }
 
-def get_fields_on_single_entry(entry_id: str, list_id: str) -> Dict[str, Any]:
+def _affinity_client() -> httpx.AsyncClient:
+    """
+    Cliente httpx asíncrono con HTTP/2: las peticiones concurrentes se multiplexan
+    sobre pocas conexiones. Requiere `pip install httpx[http2]`.
+    Se crea uno por llamada de nivel superior porque el pool queda ligado al event loop.
+    """
+    return httpx.AsyncClient(
+        http2=True,
+        headers={"Authorization": f"Bearer {api_key}"},
+        limits=httpx.Limits(max_connections=32, max_keepalive_connections=16),
+        timeout=20.0,
+    )
+
+def _retry_delay(resp, attempt: int) -> float:
+    """Segundos de espera antes de reintentar: Retry-After si es numérico, si no backoff exponencial."""
+    try:
+        return float(resp.headers.get("Retry-After"))
+    except (TypeError, ValueError):
+        return 2 ** attempt  # sin cabecera o en formato fecha HTTP
+
+async def _get_json(client: httpx.AsyncClient, url: str, semaphore: asyncio.Semaphore) -> Dict[str, Any]:
+    """GET con backoff exponencial ante 429, respetando la cabecera Retry-After."""
+    for attempt in range(AFFINITY_MAX_RETRIES):
+        async with semaphore:
+            resp = await client.get(url)
+        if resp.status_code != 429:
+            resp.raise_for_status()
+            return json_loads(resp.content)
+        await asyncio.sleep(_retry_delay(resp, attempt))
+    raise RuntimeError(f"Rate limit persistente tras {AFFINITY_MAX_RETRIES} intentos: {url}")
+
+async def get_fields_on_single_entry(
+    entry_id: str,
+    list_id: str,
+    client: Optional[httpx.AsyncClient] = None,
+    semaphore: Optional[asyncio.Semaphore] = None,
+) -> Dict[str, Any]:
     """
     Obtiene los fields de una list-entry de Affinity, sigue la paginación si existe
     y devuelve:
@@ -279,17 +343,25 @@ def get_fields_on_single_entry(entry_id: str, list_id: str) -> Dict[str, Any]:
         "normalized_fields": { <id>: {id, name, source, type, data}, ... },
         "summary": { ... }  # resumen de negocio
       }
+
+    La paginación de Affinity es por cursor (nextUrl), así que las páginas de una
+    misma entry se piden en cadena; la concurrencia real está en lanzar varias
+    entries a la vez con get_fields_on_entries compartiendo client y semaphore.
+    Uso: asyncio.run(get_fields_on_single_entry("14355566", "51750"))
     """
+    if client is None:
+        async with _affinity_client() as own_client:
+            return await get_fields_on_single_entry(entry_id, list_id, own_client, semaphore)
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(AFFINITY_CONCURRENCY)
+
     base_url = f"https://api.affinity.co/v2/lists/{list_id}/list-entries/{entry_id}/fields"
-    headers = {"Authorization": f"Bearer {api_key}"}
 
     all_fields: List[Dict[str, Any]] = []
     next_url: Optional[str] = base_url
 
     while next_url:
-        resp = requests.get(next_url, headers=headers, timeout=20)
-        resp.raise_for_status()
-        chunk = resp.json()
+        chunk = await _get_json(client, next_url, semaphore)
 
         # acumula fields
         all_fields.extend(chunk.get("data", []))
@@ -302,6 +374,63 @@ def get_fields_on_single_entry(entry_id: str, list_id: str) -> Dict[str, Any]:
     return _parse_company_payload(payload)
 
 
+async def get_fields_on_entries(entry_ids: List[str], list_id: str) -> Dict[str, Dict[str, Any]]:
+    """
+    Obtiene en paralelo los fields de varias list-entries de una misma lista.
+    Devuelve { <entry_id>: <resultado de get_fields_on_single_entry> }.
+    """
+    semaphore = asyncio.Semaphore(AFFINITY_CONCURRENCY)
+    async with _affinity_client() as client:
+        results = await asyncio.gather(
+            *(get_fields_on_single_entry(entry_id, list_id, client, semaphore) for entry_id in entry_ids)
+        )
+    return dict(zip(entry_ids, results))
+
+
+# Peticiones en vuelo de get_company_by_id_async
+_inflight: Dict[Any, asyncio.Future] = {}
+
+async def _fetch_company_name(company_id, client: httpx.AsyncClient, semaphore: asyncio.Semaphore) -> str:
+    data = await _get_json(client, f"https://api.affinity.co/v2/companies/{company_id}", semaphore)
+    return _remember_company_name(company_id, data["name"])
+
+async def get_company_by_id_async(
+    company_id,
+    client: httpx.AsyncClient,
+    semaphore: Optional[asyncio.Semaphore] = None,
+) -> str:
+    """
+    Variante asíncrona de get_company_by_id que devuelve el nombre de la empresa.
+    Si otra corrutina ya está pidiendo el mismo company_id, espera esa misma
+    petición en lugar de lanzar otra ("single-flight"); el resultado queda cacheado.
+    """
+    if company_id in _company_names:
+        return _company_names[company_id]
+
+    future = _inflight.get(company_id)
+    if future is None:
+        future = asyncio.ensure_future(
+            _fetch_company_name(company_id, client, semaphore or asyncio.Semaphore(AFFINITY_CONCURRENCY))
+        )
+        _inflight[company_id] = future
+        future.add_done_callback(lambda _: _inflight.pop(company_id, None))
+    # shield: si un llamador se cancela, la petición sigue para el resto
+    return await asyncio.shield(future)
+
+
+async def get_company_names(company_ids: List[Any]) -> Dict[Any, str]:
+    """
+    Resuelve en paralelo los nombres de varias empresas; los ids repetidos
+    comparten una única petición. Devuelve { <company_id>: <name> }.
+    """
+    semaphore = asyncio.Semaphore(AFFINITY_CONCURRENCY)
+    async with _affinity_client() as client:
+        names = await asyncio.gather(
+            *(get_company_by_id_async(company_id, client, semaphore) for company_id in company_ids)
+        )
+    return dict(zip(company_ids, names))
+
+
 def get_single_field_on_single_entry(entry_id: str, list_id: str, field_id: str) -> Optional[Dict[str, Any]]:
     """
     Obtiene un field específico de una list-entry de Affinity.
@@ -310,14 +439,22 @@ def get_single_field_on_single_entry(entry_id: str, list_id: str, field_id: str)
     El field_id es el ID que se encuentra en la primera linea debajo de cada field dentro de la field list que devuelve la función get_fields_on_single_entry.
     """
     url = "https://api.affinity.co/v2/lists/" + list_id + "/list-entries/" + entry_id + "/fields/" + field_id
-    headers = {"Authorization": f"Bearer {api_key}"}
-    response = requests.get(url, headers=headers)
+    response = SESSION.get(url)
     if response.status_code == 200:
-        data = response.json()
-        print(data)
+        data = json_loads(response.content)
+        logger.debug("field response: %s", data)
         return data
     return None
 
+def _field_value(field_id: str, value: Any) -> Dict[str, Any]:
+    """Cuerpo "value" de un field para las peticiones de actualización."""
+    return {
+        "type": field_id,
+        "data": {
+            "str": value
+        }
+    }
+
 def update_single_field_on_single_entry(entry_id: str, list_id: str, field_id: str, value: Any): ############ PENDIENTE DE PROBAR en función de si hace falta manipular rows
     """
     Actualiza un field específico de una list-entry de Affinity.
@@ -327,16 +464,8 @@ def update_single_field_on_single_entry(entry_id: str, list_id: str, field_id: s
     El value es el nuevo valor que se quiere asignar al field.
     """
     url = f"https://api.affinity.co/v2/lists/{list_id}/list-entries/{entry_id}/fields/{field_id}"
-    headers = {"Authorization": f"Bearer {api_key}"}
-    payload = {
-        "value": {
-            "type": field_id,
-            "data": {
-                "str": value
-            }
-        }
-    }
-    response = requests.put(url, headers=headers, json=payload)
+    payload = {"value": _field_value(field_id, value)}
+    response = SESSION.put(url, json=payload)
     if response.status_code == 204:
         print("Field updated successfully.")
     else: 
@@ -344,16 +473,55 @@ def update_single_field_on_single_entry(entry_id: str, list_id: str, field_id: s
     return None
 
 
+# Respuestas con las que el batch en sí no es aceptado y tiene sentido probar field a field
+_BATCH_REJECTED = frozenset({400, 404, 405, 422})
+
+def update_fields_on_single_entry(entry_id: str, list_id: str, field_values: Dict[str, Any]):
+    """
+    Actualiza varios fields de una list-entry de Affinity en una sola petición
+    (operación batch "update-fields"), en lugar de un PUT por field.
+    Si la API rechaza el batch (400/404/405/422), se actualizan uno a uno con
+    update_single_field_on_single_entry. Ante 429/5xx se reintenta el PATCH con backoff
+    (urllib3 no reintenta PATCH); cualquier otro error se informa sin más peticiones.
+
+    field_values es un dict { <field_id>: <nuevo valor> }.
+    """
+    url = f"https://api.affinity.co/v2/lists/{list_id}/list-entries/{entry_id}/fields"
+    payload = {
+        "operation": "update-fields",
+        "updates": [{"id": field_id, "value": _field_value(field_id, value)} for field_id, value in field_values.items()],
+    }
+    for attempt in range(AFFINITY_MAX_RETRIES):
+        response = SESSION.patch(url, json=payload)
+        if response.status_code != 429 and response.status_code < 500:
+            break
+        if attempt < AFFINITY_MAX_RETRIES - 1:
+            time.sleep(_retry_delay(response, attempt))
+
+    if response.ok:
+        print(f"{len(field_values)} fields updated successfully.")
+        return None
+
+    if response.status_code in _BATCH_REJECTED:
+        print(f"Batch update rejected (status {response.status_code}), updating fields one by one.")
+        for field_id, value in field_values.items():
+            update_single_field_on_single_entry(entry_id, list_id, field_id, value)
+        return None
+
+    print(f"Failed to update fields. Status code: {response.status_code}, Response: {response.text}")
+    return None
+
+
 def get_opportunities(): 
     """Get a list of opportunities."""
     url = "https://api.affinity.co/v2/opportunities"
     query = {
     "limit": "10",
     }
-    headers = {"Authorization": f"Bearer {api_key}"}
-    response = requests.get(url, headers=headers, params=query)
-    data = response.json()
-    print(data)
+    response = SESSION.get(url, params=query)
+    data = json_loads(response.content)
+    logger.debug("opportunities response: %s", data)
+    return data
 
 def get_persons(): 
     """Get a list of persons."""
@@ -361,24 +529,21 @@ def get_persons():
     query = {
     "limit": "10",
     }
-    headers = {"Authorization": f"Bearer {api_key}"}
-    response = requests.get(url, headers=headers, params=query)
-    data = response.json()
+    response = SESSION.get(url, params=query)
+    data = json_loads(response.content)
     data = data["data"]
-    for person in data:
-        name = person["firstName"]
-        lastname = person["lastName"]
-        name = f"{name} {lastname}"
-        id = person["id"]
-        email = person.get("primaryEmailAddress")
-        print(f"Person: {name} (ID: {id}, Email: {email})")
+    if data:
+        print("\n".join(
+            f"Person: {person['firstName']} {person['lastName']} (ID: {person['id']}, Email: {person.get('primaryEmailAddress')})"
+            for person in data
+        ))
 
 
 if __name__ == "__main__":
     #get_list_entries_by_list_id(51750)
     #get_single_entry_by_entry_id_on_specific_list_by_listid(14355554, 51750)
     #result = get_single_field_on_single_entry(entry_id="14355566", list_id="51750", field_id="last-event")
-    #result = get_fields_on_single_entry(entry_id="14355566", list_id="51750")
+    #result = asyncio.run(get_fields_on_single_entry(entry_id="14355566", list_id="51750"))
     get_persons()
 
     #rprint(Pretty(result["summary"], indent_guides=True))
@@ -1,16 +1,33 @@
 import asyncio
 import csv
-import json
+import functools
+import hashlib
+import math
 import os
+import re
+import sqlite3
+import sys
+import threading
+import time
 from dotenv import load_dotenv
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 from typing import List, Dict, Any, Optional
+from concurrent.futures import ThreadPoolExecutor
 
-from notion_client import Client, AsyncClient
+from notion_client import Client, AsyncClient, APIErrorCode
 from notion_client.helpers import collect_paginated_api, iterate_paginated_api
 from notion_client.errors import APIResponseError
 from pprint import pprint
 
+# fastjson.py lives at the repo root, shared with the Affinity scripts
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from fastjson import loads as json_loads, dumps as json_dumps, dumpb as json_dumpb
+
+try:
+    import pandas as pd  # optional: faster CSV export for large databases
+except ImportError:
+    pd = None
+
 # =============================================================================
 # CONFIGURATION
 # =============================================================================
@@ -24,6 +41,18 @@ api_key = os.getenv("NOTION_TOKEN")
 notion = Client(auth=api_key)
 async_notion = AsyncClient(auth=api_key)
 
+# Concurrent requests per batch (Notion allows ~3 req/s sustained, with short bursts)
+# and retries on rate_limited responses
+NOTION_CONCURRENCY = 8
+NOTION_MAX_RETRIES = 5
+
+# SQLite cache for workspace search, database schemas and page rows
+CACHE_DIR = os.path.expanduser("~/.cache/notion")
+CACHE_DB = os.path.join(CACHE_DIR, "notion_cache.db")
+CACHE_TTL = 3600  # seconds
+FULL_SYNC_MAX_AGE = 24 * 3600  # seconds; cached rows older than this are refetched in full
+_TOKEN_TAG = hashlib.sha256((api_key or "").encode()).hexdigest()[:16]
+
 
 def __init__client () -> Client: 
     """Initialize and return a Notion client."""
@@ -32,6 +61,10 @@ def __init__client () -> Client:
         raise ValueError("Missing NOTION_TOKEN environment variable")
     return Client(auth=token)
 
+# Characters dropped from URLs before looking for the ID, and the ID after "v="
+_URL_ID_STRIP = str.maketrans("", "", "-{}")
+_VIEW_ID_RE = re.compile(r"v=([0-9a-fA-F]{32})")
+
 def extract_id_from_url(url: str) -> str:
     """Extract the ID from a Notion URL: 
     1. Searches for characters "v=" and takes the next 32 characters. 
@@ -40,26 +73,168 @@ def extract_id_from_url(url: str) -> str:
                 8-4-4-4-12 (each number is the length of characters between the hyphens).
                 Example: 1429989fe8ac4effbc8f57f56486db54 becomes 1429989f-e8ac-4eff-bc8f-57f56486db54.
     """
-    url = url.strip().replace("-", "").replace("{", "").replace("}", "")
-    if "v=" in url:
-        id_start = url.split("v=")[-1]
-        #print(f"ID start: {id_start}")
-        id_part = url.split("v=")[-1][:32]
-        #print(f"ID part: {id_part}")
+    match = _VIEW_ID_RE.search(url.translate(_URL_ID_STRIP))
+    if match:
+        id_part = match.group(1)
         return f"{id_part[:8]}-{id_part[8:12]}-{id_part[12:16]}-{id_part[16:20]}-{id_part[20:]}"
     else:
-        return "url does not contain 'v='"
+        return "url does not contain 'v=' followed by a 32-character ID"
     
-def get_notion_databases():
+_CACHE_TABLES = """
+CREATE TABLE IF NOT EXISTS search_cache (key TEXT PRIMARY KEY, json TEXT NOT NULL, fetched_at REAL NOT NULL);
+CREATE TABLE IF NOT EXISTS db_schema (database_id TEXT PRIMARY KEY, json TEXT NOT NULL, fetched_at REAL NOT NULL);
+CREATE TABLE IF NOT EXISTS pages (
+    page_id TEXT PRIMARY KEY,
+    database_id TEXT NOT NULL,
+    last_edited_time TEXT NOT NULL,
+    json TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS pages_by_database ON pages (database_id);
+CREATE TABLE IF NOT EXISTS sync_state (
+    database_id TEXT PRIMARY KEY,
+    schema_edited_time TEXT,
+    full_synced_at REAL NOT NULL,
+    watermark TEXT NOT NULL
+);
+"""
+
+# One connection per thread (sqlite3 connections can't be shared across threads),
+# opened on first use and kept for the life of the thread
+_cache_local = threading.local()
+_cache_ready = False
+
+def _cache_connect():
+    """Return this thread's SQLite cache connection, creating the cache on first use"""
+    global _cache_ready
+    conn = getattr(_cache_local, "conn", None)
+    if conn is None:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        conn = sqlite3.connect(CACHE_DB)
+        if not _cache_ready:
+            conn.executescript(_CACHE_TABLES)
+            _cache_ready = True
+        _cache_local.conn = conn
+    return conn
+
+_cache_warned = False
+
+def _best_effort(default_factory=lambda: None):
+    """Make a cache helper best-effort: an unusable cache counts as a miss and writes become no-ops"""
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            global _cache_warned
+            try:
+                return func(*args, **kwargs)
+            except (sqlite3.Error, OSError, ValueError) as e:  # ValueError: corrupt cached JSON
+                if not _cache_warned:
+                    _cache_warned = True
+                    print(f"⚠️  Cache unavailable ({e}); continuing without it")
+                return default_factory()
+        return wrapper
+    return decorate
+
+@_best_effort()
+def _cache_get(key, ttl=CACHE_TTL):
+    """Return the cached search value for key, or None if missing or older than ttl seconds"""
+    row = _cache_connect().execute("SELECT json, fetched_at FROM search_cache WHERE key = ?", (key,)).fetchone()
+    if row is None or time.time() - row[1] > ttl:
+        return None
+    return json_loads(row[0])
+
+@_best_effort()
+def _cache_set(key, value):
+    """Store a search value under key"""
+    with _cache_connect() as conn:
+        conn.execute(
+            "INSERT OR REPLACE INTO search_cache (key, json, fetched_at) VALUES (?, ?, ?)",
+            (key, json_dumps(value), time.time()),
+        )
+
+@_best_effort()
+def _load_db_info(database_id, ttl=CACHE_TTL):
+    """Return the cached databases.retrieve response, or None if missing or older than ttl seconds"""
+    row = _cache_connect().execute("SELECT json, fetched_at FROM db_schema WHERE database_id = ?", (database_id,)).fetchone()
+    if row is None or time.time() - row[1] > ttl:
+        return None
+    return json_loads(row[0])
+
+@_best_effort()
+def _store_db_info(database_id, db_info):
+    """Store a databases.retrieve response"""
+    with _cache_connect() as conn:
+        conn.execute(
+            "INSERT OR REPLACE INTO db_schema (database_id, json, fetched_at) VALUES (?, ?, ?)",
+            (database_id, json_dumps(db_info), time.time()),
+        )
+
+@_best_effort(list)
+@_best_effort()
+def _drop_db_info(database_id):
+    """Remove the cached databases.retrieve response of a database"""
+    with _cache_connect() as conn:
+        conn.execute("DELETE FROM db_schema WHERE database_id = ?", (database_id,))
+
+@_best_effort(list)
+def _load_pages(database_id):
+    """Return the cached flattened rows of a database"""
+    rows = _cache_connect().execute("SELECT json FROM pages WHERE database_id = ? ORDER BY rowid", (database_id,)).fetchall()
+    return [json_loads(row[0]) for row in rows]
+
+@_best_effort()
+def _store_pages(database_id, rows, replace=False):
+    """Upsert flattened rows of a database in one transaction; replace=True drops the old rows first"""
+    with _cache_connect() as conn:
+        if replace:
+            conn.execute("DELETE FROM pages WHERE database_id = ?", (database_id,))
+        conn.executemany(
+            "INSERT INTO pages (page_id, database_id, last_edited_time, json) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT (page_id) DO UPDATE SET last_edited_time = excluded.last_edited_time, json = excluded.json",
+            [(row["notion_id"], database_id, row["last_edited_time"], json_dumps(row, default=str)) for row in rows],
+        )
+
+def _sync_watermark():
+    """Watermark for a sync starting now (last_edited_time is truncated to the minute, so back off one)"""
+    return (datetime.now(timezone.utc) - timedelta(minutes=1)).strftime("%Y-%m-%dT%H:%M:00.000Z")
+
+@_best_effort()
+def _load_sync_state(database_id):
+    """Return (schema_edited_time, full_synced_at, watermark) of a database's last sync, or None"""
+    return _cache_connect().execute(
+        "SELECT schema_edited_time, full_synced_at, watermark FROM sync_state WHERE database_id = ?", (database_id,)
+    ).fetchone()
+
+@_best_effort()
+def _store_sync_state(database_id, watermark, schema_edited_time=None, full=False):
+    """Record a successful sync that started at watermark; full=True also records the schema it ran against"""
+    with _cache_connect() as conn:
+        if full:
+            conn.execute(
+                "INSERT OR REPLACE INTO sync_state (database_id, schema_edited_time, full_synced_at, watermark) "
+                "VALUES (?, ?, ?, ?)",
+                (database_id, schema_edited_time, time.time(), watermark),
+            )
+        else:
+            conn.execute("UPDATE sync_state SET watermark = ? WHERE database_id = ?", (watermark, database_id))
+
+def get_notion_databases(use_cache=True):
     """
     Discover all databases accessible to the Notion integration
     
     Args:
-        notion_client: Authenticated Notion client
+        use_cache: Reuse a search result cached on disk within CACHE_TTL
         
     Returns:
         dict: {database_name: database_id}
     """
+    cache_key = f"search_{_TOKEN_TAG}"
+    database_mapping = _cache_get(cache_key) if use_cache else None
+    if database_mapping:
+        print(f"🔍 Found {len(database_mapping)} databases (cached):")
+        for name in database_mapping.keys():
+            print(f"  - {name}")
+        return database_mapping
+    
     try:
         # Search for all content
         results = notion.search()
@@ -76,20 +251,55 @@ def get_notion_databases():
             
             database_mapping[title] = database["id"]
         
-        print(f"🔍 Found {len(database_mapping)} databases:")
-        for name in database_mapping.keys():
-            print(f"  - {name}")
-            
-        return database_mapping
-        
     except Exception as e:
         print(f"❌ Error discovering databases: {e}")
         return {}
+    
+    if database_mapping:
+        _cache_set(cache_key, database_mapping)
+    
+    print(f"🔍 Found {len(database_mapping)} databases:")
+    for name in database_mapping.keys():
+        print(f"  - {name}")
+        
+    return database_mapping
 
 
-def get_database_schema(database_ids):
+def _rate_limit_delay(error, attempt):
+    """Seconds to wait before retrying: Retry-After header if present, else exponential"""
+    retry_after = error.headers.get("Retry-After") if error.headers else None
+    try:
+        return float(retry_after)
+    except (TypeError, ValueError):  # missing, or the HTTP-date form
+        return 2 ** attempt
+
+
+async def _notion_call(semaphore, method, **kwargs):
+    """Run an AsyncClient endpoint under the semaphore, backing off on rate_limited errors"""
+    for attempt in range(NOTION_MAX_RETRIES):
+        try:
+            async with semaphore:
+                return await method(**kwargs)
+        except APIResponseError as e:
+            if e.code != APIErrorCode.RateLimited or attempt == NOTION_MAX_RETRIES - 1:
+                raise
+            await asyncio.sleep(_rate_limit_delay(e, attempt))
+
+
+def _call_with_retry(method, **kwargs):
+    """Synchronous counterpart of _notion_call for Client endpoints (callers bound concurrency)"""
+    for attempt in range(NOTION_MAX_RETRIES):
+        try:
+            return method(**kwargs)
+        except APIResponseError as e:
+            if e.code != APIErrorCode.RateLimited or attempt == NOTION_MAX_RETRIES - 1:
+                raise
+            time.sleep(_rate_limit_delay(e, attempt))
+
+
+async def get_database_schema_async(database_ids):
     """
-    Get the schema/structure of databases
+    Get the schema/structure of databases, retrieving all of them concurrently
     
     Args:
         database_ids: dict of {name: id}
@@ -97,108 +307,223 @@ def get_database_schema(database_ids):
     Returns:
         dict: {database_name: {properties}}
     """
-    schemas = {}
+    semaphore = asyncio.Semaphore(NOTION_CONCURRENCY)
     
-    for name, db_id in database_ids.items():
-        try:
-            db_info = notion.databases.retrieve(database_id=db_id)
-            schemas[name] = {
+    async with AsyncClient(auth=api_key) as client:
+        async def fetch_one(name, db_id):
+            db_info = _load_db_info(db_id)
+            if db_info is None:
+                try:
+                    db_info = await _notion_call(semaphore, client.databases.retrieve, database_id=db_id)
+                except Exception as e:
+                    print(f"❌ Error getting schema for {name}: {e}")
+                    return name, {}
+                _store_db_info(db_id, db_info)
+            return name, {
                 prop_name: prop_info['type'] 
                 for prop_name, prop_info in db_info["properties"].items() # type: ignore
             }
-            
-            print(f"\n📋 {name} Schema:")
-            for prop_name, prop_type in schemas[name].items():
-                print(f"  - {prop_name}: {prop_type}")
-                
-        except Exception as e:
-            print(f"❌ Error getting schema for {name}: {e}")
-            schemas[name] = {}
+        
+        results = await asyncio.gather(*[fetch_one(name, db_id) for name, db_id in database_ids.items()])
+    
+    schemas = dict(results)
+    for name, schema in schemas.items():
+        print(f"\n📋 {name} Schema:")
+        for prop_name, prop_type in schema.items():
+            print(f"  - {prop_name}: {prop_type}")
     
     return schemas
 
 
+def get_database_schema(database_ids):
+    """Synchronous entry point for get_database_schema_async"""
+    return asyncio.run(get_database_schema_async(database_ids))
+
+
+def _extract_title(x):
+    return x["title"][0]["plain_text"] if x["title"] else ""
+
+def _extract_rich_text(x):
+    return " ".join(text["plain_text"] for text in x["rich_text"])
+
+def _extract_number(x):
+    return x["number"]
+
+def _extract_select(x):
+    return x["select"]["name"] if x["select"] else None
+
+def _extract_multi_select(x):
+    return [option["name"] for option in x["multi_select"]]
+
+def _extract_date(x):
+    return x["date"]["start"] if x["date"] else None
+
+def _extract_checkbox(x):
+    return x["checkbox"]
+
+def _extract_url(x):
+    return x["url"]
+
+def _extract_email(x):
+    return x["email"]
+
+def _extract_phone_number(x):
+    return x["phone_number"]
+
+def _extract_people(x):
+    return [person["name"] for person in x["people"]]
+
+def _extract_files(x):
+    return [file["name"] for file in x["files"]]
+
+def _extract_formula(x):
+    return x["formula"].get("string") or x["formula"].get("number")
+
+def _extract_relation(x):
+    return len(x["relation"])  # Just count of relations
+
+def _extract_rollup(x):
+    return x["rollup"].get("number") or x["rollup"].get("array", [])
+
+def _extract_default(x):
+    return str(x.get(x["type"], ""))
+
+# Built once at import instead of on every property of every row
+_EXTRACTORS = {
+    "title": _extract_title,
+    "rich_text": _extract_rich_text,
+    "number": _extract_number,
+    "select": _extract_select,
+    "multi_select": _extract_multi_select,
+    "date": _extract_date,
+    "checkbox": _extract_checkbox,
+    "url": _extract_url,
+    "email": _extract_email,
+    "phone_number": _extract_phone_number,
+    "people": _extract_people,
+    "files": _extract_files,
+    "formula": _extract_formula,
+    "relation": _extract_relation,
+    "rollup": _extract_rollup,
+}
+
 def extract_property_value(prop_value):
     """Helper function to extract values from different property types"""
-    prop_type = prop_value["type"]
-    
-    extractors = {
-        "title": lambda x: x["title"][0]["plain_text"] if x["title"] else "",
-        "rich_text": lambda x: " ".join([text["plain_text"] for text in x["rich_text"]]),
-        "number": lambda x: x["number"],
-        "select": lambda x: x["select"]["name"] if x["select"] else None,
-        "multi_select": lambda x: [option["name"] for option in x["multi_select"]],
-        "date": lambda x: x["date"]["start"] if x["date"] else None,
-        "checkbox": lambda x: x["checkbox"],
-        "url": lambda x: x["url"],
-        "email": lambda x: x["email"],
-        "phone_number": lambda x: x["phone_number"],
-        "people": lambda x: [person["name"] for person in x["people"]],
-        "files": lambda x: [file["name"] for file in x["files"]],
-        "formula": lambda x: x["formula"].get("string") or x["formula"].get("number"),
-        "relation": lambda x: len(x["relation"]),  # Just count of relations
-        "rollup": lambda x: x["rollup"].get("number") or x["rollup"].get("array", [])
+    return _EXTRACTORS.get(prop_value["type"], _extract_default)(prop_value)
+
+def _flatten_page(page):
+    """Flatten a Notion page object into metadata plus extracted property values"""
+    page_data = {
+        "notion_id": page["id"],
+        "created_time": page["created_time"],
+        "last_edited_time": page["last_edited_time"],
+        "notion_url": page["url"]
     }
     
-    return extractors.get(prop_type, lambda x: str(x.get(prop_type, "")))(prop_value)
+    # Extract all properties
+    for prop_name, prop_value in page["properties"].items():
+        page_data[prop_name] = extract_property_value(prop_value)
+    
+    return page_data
+
+
+def _flatten_pages(pages):
+    """Flatten a batch of Notion page objects"""
+    return [_flatten_page(page) for page in pages]
+
 
-def extract_all_database_data(database_ids):
+async def extract_all_database_data_async(database_ids, use_cache=True):
     """
-    Extract all data from specified databases
+    Extract all data from specified databases, querying the databases concurrently
+    
+    Rows are kept in the SQLite cache; with use_cache only pages edited since the
+    last successful sync started are fetched. A database is refetched in full (replacing its
+    cached rows, which drops deleted pages and refreshes formulas/rollups) when its
+    schema changed since the last full sync or that sync is older than
+    FULL_SYNC_MAX_AGE.
     
     Args:
-        notion_client: Authenticated Notion client
         database_ids: dict of {database_name: database_id}
+        use_cache: Fetch only changed pages on top of the cached rows; False always refetches in full
         
     Returns:
         dict: {database_name: [list of entries]}
     """
-    all_data = {}
+    semaphore = asyncio.Semaphore(NOTION_CONCURRENCY)
+    loop = asyncio.get_running_loop()
     
-    for name, db_id in database_ids.items():
-        print(f"\n🔍 Extracting from {name}...")
-        
-        try:
-            # Handle pagination for large databases
-            all_pages = []
-            has_more = True
-            start_cursor = None
+    async with AsyncClient(auth=api_key) as client:
+        async def fetch_one(name, db_id):
+            print(f"\n🔍 Extracting from {name}...")
             
-            while has_more:
-                query_params = {"database_id": db_id}
-                if start_cursor:
-                    query_params["start_cursor"] = start_cursor
+            pending = None
+            try:
+                database_data = []
+                # Built once; only start_cursor changes between pages (the kwargs are
+                # unpacked when each task is created, so updating it is safe)
+                query_params = {"database_id": db_id, "page_size": 100}  # API maximum
                 
-                query_result = notion.databases.query(**query_params)
-                all_pages.extend(query_result["results"]) # type: ignore
+                # Taken before any request: edits made while this sync runs are picked up next time
+                watermark = _sync_watermark()
                 
-                has_more = query_result["has_more"] # type: ignore
-                start_cursor = query_result.get("next_cursor") # type: ignore
-            
-            # Process all pages
-            database_data = []
-            for page in all_pages:
-                page_data = {
-                    "notion_id": page["id"],
-                    "created_time": page["created_time"],
-                    "last_edited_time": page["last_edited_time"],
-                    "notion_url": page["url"]
-                }
+                # The schema's last_edited_time tells whether cached rows still have the right columns;
+                # reuse a response stored moments ago by prefetch_all_schemas/get_database_schema
+                db_info = _load_db_info(db_id, ttl=SCHEMA_TTL)
+                if db_info is None:
+                    db_info = await _notion_call(semaphore, client.databases.retrieve, database_id=db_id)
+                    _store_db_info(db_id, db_info)
+                schema_edited_time = db_info.get("last_edited_time") # type: ignore
                 
-                # Extract all properties
-                for prop_name, prop_value in page["properties"].items():
-                    page_data[prop_name] = extract_property_value(prop_value)
+                cached_rows = _load_pages(db_id) if use_cache else []
+                sync_state = _load_sync_state(db_id) if cached_rows else None
+                if (sync_state is None or sync_state[0] != schema_edited_time
+                        or time.time() - sync_state[1] > FULL_SYNC_MAX_AGE):
+                    cached_rows = []  # full refetch
                 
-                database_data.append(page_data)
-            
-            all_data[name] = database_data
-            print(f"✅ Extracted {len(database_data)} entries from {name}")
-            
-        except Exception as e:
-            print(f"❌ Error extracting from {name}: {e}")
-            all_data[name] = []
+                if cached_rows:
+                    # Not derived from the cached rows: rows written by _patch_row would move it past unsynced edits
+                    query_params["filter"] = {"timestamp": "last_edited_time", "last_edited_time": {"on_or_after": sync_state[2]}}
+                pending = asyncio.create_task(_notion_call(semaphore, client.databases.query, **query_params))
+                
+                while pending:
+                    query_result = await pending
+                    pending = None
+                    
+                    # Request the next page before processing this one
+                    if query_result["has_more"]: # type: ignore
+                        query_params["start_cursor"] = query_result["next_cursor"] # type: ignore
+                        pending = asyncio.create_task(_notion_call(semaphore, client.databases.query, **query_params))
+                    
+                    # Flatten in a worker thread so the loop keeps the next request moving
+                    rows = await loop.run_in_executor(executor, _flatten_pages, query_result["results"]) # type: ignore
+                    database_data.extend(rows)
+                
+                _store_pages(db_id, database_data, replace=not cached_rows)
+                _store_sync_state(db_id, watermark, schema_edited_time, full=not cached_rows)
+                if cached_rows:
+                    merged = {row["notion_id"]: row for row in cached_rows}
+                    merged.update((row["notion_id"], row) for row in database_data)
+                    print(f"✅ {len(database_data)} changed entries in {name} ({len(merged)} total)")
+                    return name, list(merged.values())
+                
+                print(f"✅ Extracted {len(database_data)} entries from {name}")
+                return name, database_data
+                
+            except Exception as e:
+                if pending:
+                    pending.cancel()
+                print(f"❌ Error extracting from {name}: {e}")
+                return name, []
+        
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            results = await asyncio.gather(*[fetch_one(name, db_id) for name, db_id in database_ids.items()])
     
-    return all_data
+    return dict(results)
+
+
+def extract_all_database_data(database_ids, use_cache=True):
+    """Synchronous entry point for extract_all_database_data_async"""
+    return asyncio.run(extract_all_database_data_async(database_ids, use_cache))
 
 def filter_database_data(notion_client, database_id, filters=None, sorts=None, limit=None):
     """
@@ -250,24 +575,38 @@ def export_data_to_csv(database_data, output_dir="./exports"):
         safe_name = db_name.replace(" ", "_").replace("/", "_").lower()
         filepath = os.path.join(output_dir, f"{safe_name}.csv")
         
-        # Get all unique keys
-        all_keys = set()
-        for entry in data:
-            all_keys.update(entry.keys())
-        
-        with open(filepath, 'w', newline='', encoding='utf-8') as csvfile:
-            writer = csv.DictWriter(csvfile, fieldnames=sorted(all_keys))
-            writer.writeheader()
-            writer.writerows(data)
+        if pd is not None:
+            # Columns are the union of keys in first-seen order; object dtype keeps
+            # integer columns with gaps from being written as floats
+            pd.DataFrame(data, dtype=object).to_csv(filepath, index=False, encoding='utf-8')
+        else:
+            # Get all unique keys, in first-seen order
+            fieldnames = list(dict.fromkeys(k for entry in data for k in entry))
+            
+            with open(filepath, 'w', newline='', encoding='utf-8', buffering=1 << 20) as csvfile:
+                writer = csv.DictWriter(csvfile, fieldnames=fieldnames, extrasaction="ignore")
+                writer.writeheader()
+                writer.writerows(data)
         
         print(f"📁 Exported {db_name} to {filepath}")
 
 def export_data_to_json(database_data, filename="notion_export.json"):
     """Export all database data to JSON"""
-    with open(filename, "w", encoding="utf-8") as f:
-        json.dump(database_data, f, indent=2, default=str)
+    with open(filename, "wb") as f:
+        f.write(json_dumpb(database_data, indent=True, default=str))
     print(f"📁 Exported all data to {filename}")
 
+def export_data_to_jsonl(database_data, filename="notion_export.jsonl"):
+    """Export all database data to JSON Lines, one entry per line tagged with its database"""
+    count = 0
+    with open(filename, "wb", buffering=1 << 20) as f:
+        for db_name, rows in database_data.items():
+            for row in rows:
+                f.write(json_dumpb({"_db": db_name, **row}, default=str))
+                f.write(b"\n")
+                count += 1
+    print(f"📁 Exported {count} entries to {filename}")
+
 def analyze_database_data(database_data):
     """Analyze and summarize the extracted data"""
     print(f"\n📈 DATA ANALYSIS")
@@ -287,13 +626,13 @@ def analyze_database_data(database_data):
                 print(f"   Date range: {min(dates)[:10]} to {max(dates)[:10]}")
 
 
-def main_notion_workflow():
-    """Complete workflow for Notion data extraction"""
+def main_notion_workflow(refresh=False):
+    """Complete workflow for Notion data extraction (refresh=True ignores the cache)"""
     # Initialize client    
     __init__client()
 
     # Step 1: Discover databases
-    database_ids = get_notion_databases() # type: ignore
+    database_ids = get_notion_databases(use_cache=not refresh) # type: ignore
     if not database_ids:
         print("No databases found!")
         return
@@ -302,7 +641,7 @@ def main_notion_workflow():
     schemas = get_database_schema(database_ids) # type: ignore
     
     # Step 3: Extract all data
-    all_data = extract_all_database_data(database_ids)
+    all_data = extract_all_database_data(database_ids, use_cache=not refresh)
     
     # Step 4: Analyze data
     analyze_database_data(all_data)
@@ -399,139 +738,212 @@ def interactive_action_selector():
 
 # =============================================================================
 # INPUT VALIDATION FUNCTIONS
+SCHEMA_TTL = 300  # seconds
+_SCHEMA_CACHE: Dict[str, tuple] = {}  # database_id -> (fetched_at, property_options)
+
+def invalidate_schema(database_id):
+    """Drop the cached property options of a database so the next lookup re-fetches them"""
+    _SCHEMA_CACHE.pop(database_id, None)
+    _drop_db_info(database_id)
+
+def _adds_schema_options(property_options, properties):
+    """True if a select/multi_select value is not a known option (Notion adds it to the schema)"""
+    for prop_name, prop_value in properties.items():
+        if "select" in prop_value:
+            names = [prop_value["select"]["name"]]
+        elif "multi_select" in prop_value:
+            names = [option["name"] for option in prop_value["multi_select"]]
+        else:
+            continue
+        known = property_options.get(prop_name, {}).get("options") or []
+        if any(name not in known for name in names):
+            return True
+    return False
+
+def _prompt_hint(prop_type, options):
+    """Input hint shown under a property's prompt (built once per schema load)"""
+    if prop_type == "select" and options:
+        return f"\n   Options: {', '.join(options)}"
+    elif prop_type == "multi_select" and options:
+        return f"\n   Options: {', '.join(options)} (comma-separated)"
+    elif prop_type == "checkbox":
+        return "\n   Enter: yes/no, true/false, or 1/0"
+    elif prop_type == "date":
+        return "\n   Format: YYYY-MM-DD (e.g., 2024-03-20)"
+    elif prop_type == "number":
+        return "\n   Enter any number (integer or decimal)"
+    return ""
+
 def get_database_property_options(notion_client, database_id):
-    """Get available options for select, multi_select, and other constrained fields"""
-    try:
-        db_info = notion_client.databases.retrieve(database_id=database_id)
-        property_options = {}
-        
-        for prop_name, prop_info in db_info["properties"].items():
-            if prop_info["type"] == "select" and "select" in prop_info:
-                options = [opt["name"] for opt in prop_info["select"].get("options", [])]
-                property_options[prop_name] = {"type": "select", "options": options}
-                
-            elif prop_info["type"] == "multi_select" and "multi_select" in prop_info:
-                options = [opt["name"] for opt in prop_info["multi_select"].get("options", [])]
-                property_options[prop_name] = {"type": "multi_select", "options": options}
-                
-            else:
-                property_options[prop_name] = {"type": prop_info["type"], "options": None}
+    """Get available options for select, multi_select, and other constrained fields (cached for SCHEMA_TTL)"""
+    cached = _SCHEMA_CACHE.get(database_id)
+    if cached and time.time() - cached[0] < SCHEMA_TTL:
+        return cached[1]
+    
+    db_info = _load_db_info(database_id, ttl=SCHEMA_TTL)
+    if db_info is None:
+        try:
+            db_info = _call_with_retry(notion_client.databases.retrieve, database_id=database_id)
+        except Exception as e:
+            print(f"❌ Error getting property options: {e}")
+            return {}
+        _store_db_info(database_id, db_info)
+    
+    property_options = {}
+    
+    for prop_name, prop_info in db_info["properties"].items():
+        if prop_info["type"] == "select" and "select" in prop_info:
+            options = [opt["name"] for opt in prop_info["select"].get("options", [])]
+            property_options[prop_name] = {"type": "select", "options": options, "options_set": frozenset(options)}
+            
+        elif prop_info["type"] == "multi_select" and "multi_select" in prop_info:
+            options = [opt["name"] for opt in prop_info["multi_select"].get("options", [])]
+            property_options[prop_name] = {"type": "multi_select", "options": options, "options_set": frozenset(options)}
+            
+        else:
+            property_options[prop_name] = {"type": prop_info["type"], "options": None}
         
-        return property_options
-    except Exception as e:
-        print(f"❌ Error getting property options: {e}")
-        return {}
+        entry = property_options[prop_name]
+        entry["prompt_hint"] = _prompt_hint(entry["type"], entry["options"])
+    
+    _SCHEMA_CACHE[database_id] = (time.time(), property_options)
+    return property_options
 
-def validate_and_convert_input(value, prop_type, prop_options=None):
+def prefetch_all_schemas(notion_client, database_ids):
+    """Load the property options of every database concurrently into the schema cache"""
+    ids = list(database_ids.values())
+    if not ids:
+        return
+    with ThreadPoolExecutor(max_workers=min(NOTION_CONCURRENCY, len(ids))) as executor:
+        list(executor.map(lambda db_id: get_database_property_options(notion_client, db_id), ids))
+
+# Compiled/built once instead of on every validation
+_DATE_RE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+_URL_RE = re.compile(r"https?://\S+")
+_EMAIL_RE = re.compile(r"[^@\s]+@[^@\s]+\.[^@\s]+")
+_CHECKBOX_TRUE = frozenset({'true', 't', 'yes', 'y', '1', 'on'})
+_CHECKBOX_FALSE = frozenset({'false', 'f', 'no', 'n', '0', 'off', ''})
+_OK_NONE = (True, None, None)  # shared result for empty input
+_READONLY_TYPES = frozenset({"formula", "rollup", "created_time", "created_by", "last_edited_time", "last_edited_by"})
+
+def _v_text(value, prop_options, prop_options_set):
+    return True, value, None
+
+def _v_number(value, prop_options, prop_options_set):
+    # Try int first, then float (also covers 1e3, +1, 1_000)
+    try:
+        return True, int(value), None
+    except ValueError:
+        pass
+    try:
+        number = float(value)
+    except ValueError:
+        return False, None, "Must be a number"
+    if not math.isfinite(number):  # nan/inf are not valid JSON numbers
+        return False, None, "Must be a number"
+    return True, number, None
+
+def _v_checkbox(value, prop_options, prop_options_set):
+    lower_val = value.lower()
+    if lower_val in _CHECKBOX_TRUE:
+        return True, True, None
+    elif lower_val in _CHECKBOX_FALSE:
+        return True, False, None
+    else:
+        return False, None, "Enter yes/no, true/false, or 1/0"
+
+def _v_select(value, prop_options, prop_options_set):
+    if not prop_options:
+        return True, value, None
+    
+    if value in prop_options_set:
+        return True, value, None
+    else:
+        return False, None, f"Must be one of: {', '.join(prop_options)}"
+
+def _v_multi_select(value, prop_options, prop_options_set):
+    # Split by comma and clean up
+    selected = [item.strip() for item in value.split(',')]
+    
+    if prop_options:
+        invalid = [item for item in selected if item not in prop_options_set]
+        if invalid:
+            return False, None, f"Invalid options: {', '.join(invalid)}. Available: {', '.join(prop_options)}"
+    
+    return True, selected, None
+
+def _v_date(value, prop_options, prop_options_set):
+    # YYYY-MM-DD format
+    if _DATE_RE.match(value):
+        try:
+            datetime.strptime(value, '%Y-%m-%d')
+            return True, value, None
+        except ValueError:
+            return False, None, "Invalid date format"
+    else:
+        return False, None, "Use YYYY-MM-DD format (e.g., 2024-03-20)"
+
+def _v_url(value, prop_options, prop_options_set):
+    if _URL_RE.fullmatch(value):
+        return True, value, None
+    else:
+        return False, None, "Must start with http:// or https:// and contain no spaces"
+
+def _v_email(value, prop_options, prop_options_set):
+    if _EMAIL_RE.fullmatch(value):
+        return True, value, None
+    else:
+        return False, None, "Must be a valid email address"
+
+def _v_readonly(prop_type):
+    """Validator that rejects any input for a read-only property type"""
+    def validate(value, prop_options, prop_options_set):
+        return False, None, f"{prop_type} is read-only and cannot be edited"
+    return validate
+
+_VALIDATORS = {
+    "title": _v_text,
+    "rich_text": _v_text,
+    "number": _v_number,
+    "checkbox": _v_checkbox,
+    "select": _v_select,
+    "multi_select": _v_multi_select,
+    "date": _v_date,
+    "url": _v_url,
+    "email": _v_email,
+    "phone_number": _v_text,  # Notion is flexible with phone formats
+}
+_VALIDATORS.update((prop_type, _v_readonly(prop_type)) for prop_type in _READONLY_TYPES)
+
+def validate_and_convert_input(value, prop_type, prop_options=None, prop_options_set=None):
     """
     Validate user input against Notion property type
     
     Args:
         value: User input string
         prop_type: Notion property type
-        prop_options: Available options for select/multi_select
+        prop_options: Available options for select/multi_select (used in error messages)
+        prop_options_set: frozenset of prop_options for membership tests; built if omitted
         
     Returns:
         tuple: (is_valid, converted_value, error_message)
     """
-    if not value.strip() and prop_type not in ["checkbox"]:
-        return True, None, None  # Empty is usually OK
+    # Strip once; validators receive the stripped value
+    v = value.strip()
+    if not v and prop_type != "checkbox":
+        return _OK_NONE  # Empty is usually OK
     
     try:
-        if prop_type == "title" or prop_type == "rich_text":
-            return True, value.strip(), None
-            
-        elif prop_type == "number":
-            if value.strip() == "":
-                return True, None, None
-            try:
-                # Try int first, then float
-                if '.' in value:
-                    return True, float(value), None
-                else:
-                    return True, int(value), None
-            except ValueError:
-                return False, None, "Must be a number"
-                
-        elif prop_type == "checkbox":
-            lower_val = value.lower().strip()
-            if lower_val in ['true', 't', 'yes', 'y', '1', 'on']:
-                return True, True, None
-            elif lower_val in ['false', 'f', 'no', 'n', '0', 'off', '']:
-                return True, False, None
-            else:
-                return False, None, "Enter yes/no, true/false, or 1/0"
-                
-        elif prop_type == "select":
-            if not prop_options:
-                return True, value.strip(), None
-            
-            if value.strip() in prop_options:
-                return True, value.strip(), None
-            else:
-                return False, None, f"Must be one of: {', '.join(prop_options)}"
-                
-        elif prop_type == "multi_select":
-            if not value.strip():
-                return True, [], None
-                
-            # Split by comma and clean up
-            selected = [item.strip() for item in value.split(',')]
-            
-            if prop_options:
-                invalid = [item for item in selected if item not in prop_options]
-                if invalid:
-                    return False, None, f"Invalid options: {', '.join(invalid)}. Available: {', '.join(prop_options)}"
-            
-            return True, selected, None
-            
-        elif prop_type == "date":
-            if value.strip() == "":
-                return True, None, None
-                
-            # Try to parse common date formats
-            import re
-            from datetime import datetime
-            
-            # YYYY-MM-DD format
-            if re.match(r'^\d{4}-\d{2}-\d{2}$', value.strip()):
-                try:
-                    datetime.strptime(value.strip(), '%Y-%m-%d')
-                    return True, value.strip(), None
-                except ValueError:
-                    return False, None, "Invalid date format"
-            else:
-                return False, None, "Use YYYY-MM-DD format (e.g., 2024-03-20)"
-                
-        elif prop_type == "url":
-            if value.strip() == "":
-                return True, None, None
-            if value.startswith(('http://', 'https://')):
-                return True, value.strip(), None
-            else:
-                return False, None, "Must start with http:// or https://"
-                
-        elif prop_type == "email":
-            if value.strip() == "":
-                return True, None, None
-            if '@' in value and '.' in value:
-                return True, value.strip(), None
-            else:
-                return False, None, "Must be a valid email address"
-                
-        elif prop_type == "phone_number":
-            return True, value.strip(), None  # Notion is flexible with phone formats
-            
-        elif prop_type in ["formula", "rollup", "created_time", "created_by", "last_edited_time", "last_edited_by"]:
-            return False, None, f"{prop_type} is read-only and cannot be edited"
-            
-        else:
-            return True, value.strip(), None  # Default: accept as string
-            
+        # Unknown types are accepted as plain strings
+        if prop_options and prop_options_set is None:
+            prop_options_set = frozenset(prop_options)
+        return _VALIDATORS.get(prop_type, _v_text)(v, prop_options, prop_options_set)
     except Exception as e:
         return False, None, f"Validation error: {str(e)}"
 
-def collect_property_input(prop_name, prop_type, prop_options=None, current_value=None):
+_UNCHANGED = object()  # returned by collect_property_input when the input equals current_value
+
+def collect_property_input(prop_name, prop_type, prop_options=None, current_value=None, prop_options_set=None, prompt_hint=None):
     """
     Collect and validate input for a single property
     
@@ -540,12 +952,14 @@ def collect_property_input(prop_name, prop_type, prop_options=None, current_valu
         prop_type: Type of the property
         prop_options: Available options (for select/multi_select)
         current_value: Current value (for editing)
+        prop_options_set: frozenset of prop_options, as stored by get_database_property_options
+        prompt_hint: Precomputed hint, as stored by get_database_property_options; built if omitted
         
     Returns:
-        Validated value or None if skipped
+        Validated value, None if skipped, or _UNCHANGED if it equals current_value
     """
     # Skip read-only properties
-    if prop_type in ["formula", "rollup", "created_time", "created_by", "last_edited_time", "last_edited_by"]:
+    if prop_type in _READONLY_TYPES:
         print(f"⏭️  Skipping {prop_name} ({prop_type} is read-only)")
         return None
     
@@ -556,16 +970,9 @@ def collect_property_input(prop_name, prop_type, prop_options=None, current_valu
         prompt += f" [current: {current_value}]"
     
     # Add helpful hints
-    if prop_type == "select" and prop_options:
-        prompt += f"\n   Options: {', '.join(prop_options)}"
-    elif prop_type == "multi_select" and prop_options:
-        prompt += f"\n   Options: {', '.join(prop_options)} (comma-separated)"
-    elif prop_type == "checkbox":
-        prompt += "\n   Enter: yes/no, true/false, or 1/0"
-    elif prop_type == "date":
-        prompt += "\n   Format: YYYY-MM-DD (e.g., 2024-03-20)"
-    elif prop_type == "number":
-        prompt += "\n   Enter any number (integer or decimal)"
+    if prompt_hint is None:
+        prompt_hint = _prompt_hint(prop_type, prop_options)
+    prompt += prompt_hint
     
     prompt += f"\n   Enter value (or press Enter to skip): "
     
@@ -579,10 +986,12 @@ def collect_property_input(prop_name, prop_type, prop_options=None, current_valu
             
             # Validate input
             is_valid, converted_value, error_msg = validate_and_convert_input(
-                user_input, prop_type, prop_options
+                user_input, prop_type, prop_options, prop_options_set
             )
             
             if is_valid:
+                if current_value is not None and converted_value == current_value:
+                    return _UNCHANGED
                 return converted_value
             else:
                 print(f"❌ {error_msg}")
@@ -620,13 +1029,152 @@ def create_notion_property_value(prop_type, value):
         # Default to rich_text for unknown types
         return {"rich_text": [{"text": {"content": str(value)}}]}
 
-def interactive_create_page(notion_client, database_id, database_name):
-    """Interactive page creation"""
+def _build_page_properties(property_options, values):
+    """
+    Validate a {property_name: value} dict and convert it to Notion API properties
+    
+    Returns:
+        tuple: (page_properties, errors) where errors is {property_name: error_message}
+    """
+    page_properties = {}
+    errors = {}
+    
+    for prop_name, raw_value in values.items():
+        prop_info = property_options.get(prop_name)
+        if prop_info is None:
+            errors[prop_name] = "Unknown property"
+            continue
+        if raw_value is None:
+            continue  # null skips the property, for checkboxes too
+        
+        # Validators take user-style strings; lists become comma-separated
+        if isinstance(raw_value, list):
+            text = ", ".join(str(item) for item in raw_value)
+        else:
+            text = str(raw_value)
+        
+        prop_type = prop_info["type"]
+        is_valid, converted_value, error_msg = validate_and_convert_input(
+            text, prop_type, prop_info.get("options"), prop_info.get("options_set")
+        )
+        if not is_valid:
+            errors[prop_name] = error_msg
+        elif converted_value is not None:
+            page_properties[prop_name] = create_notion_property_value(prop_type, converted_value)
+    
+    return page_properties, errors
+
+def _create_page(notion_client, database_id, property_options, page_properties):
+    """pages.create with already converted properties; reports the result and returns the page or None"""
+    try:
+        new_page = notion_client.pages.create(
+            parent={"database_id": database_id},
+            properties=page_properties
+        )
+        if _adds_schema_options(property_options, page_properties):
+            invalidate_schema(database_id)
+        print(f"🎉 Successfully created page!")
+        print(f"📄 Page ID: {new_page['id']}")
+        print(f"🔗 URL: {new_page['url']}")
+        return new_page
+        
+    except Exception as e:
+        print(f"❌ Error creating page: {e}")
+        return None
+
+def create_page_from_dict(notion_client, database_id, values, property_options=None):
+    """
+    Create a page from a {property_name: value} dict with a single pages.create call
+    
+    All values are validated up front and every error is reported at once.
+    
+    Args:
+        property_options: Output of get_database_property_options; fetched if omitted
+    
+    Returns:
+        The created page, or None if validation or the API call failed
+    """
+    if property_options is None:
+        property_options = get_database_property_options(notion_client, database_id)
+    page_properties, errors = _build_page_properties(property_options, values)
+    
+    if errors:
+        for prop_name, error_msg in errors.items():
+            print(f"❌ {prop_name}: {error_msg}")
+        return None
+    
+    if not page_properties:
+        print("❌ No properties provided. Page creation cancelled.")
+        return None
+    
+    return _create_page(notion_client, database_id, property_options, page_properties)
+
+def bulk_create_pages(notion_client, database_id, rows, property_options=None):
+    """
+    Create one page per {property_name: value} dict, NOTION_CONCURRENCY at a time
+    
+    Rows that fail validation are reported and skipped before any request is made.
+    
+    Args:
+        rows: list of {property_name: value} dicts (e.g. from csv.DictReader)
+        property_options: Output of get_database_property_options; fetched if omitted
+        
+    Returns:
+        list: The created page for each row, or None where validation or creation failed
+    """
+    if property_options is None:
+        property_options = get_database_property_options(notion_client, database_id)
+    
+    built = [_build_page_properties(property_options, row) for row in rows]
+    for i, (_, errors) in enumerate(built, 1):
+        for prop_name, error_msg in errors.items():
+            print(f"❌ Row {i} {prop_name}: {error_msg}")
+    
+    def create_one(item):
+        page_properties, errors = item
+        if errors or not page_properties:
+            return None
+        try:
+            return _call_with_retry(
+                notion_client.pages.create,
+                parent={"database_id": database_id},
+                properties=page_properties
+            )
+        except Exception as e:
+            print(f"❌ Error creating page: {e}")
+            return None
+    
+    with ThreadPoolExecutor(max_workers=NOTION_CONCURRENCY) as executor:
+        created = list(executor.map(create_one, built))
+    
+    if any(
+        page and _adds_schema_options(property_options, page_properties)
+        for page, (page_properties, _) in zip(created, built)
+    ):
+        invalidate_schema(database_id)
+    
+    print(f"🎉 Created {sum(page is not None for page in created)}/{len(rows)} pages")
+    return created
+
+def interactive_create_page(notion_client, database_id, database_name, property_options):
+    """Interactive page creation (property_options from get_database_property_options)"""
     print(f"\n📄 Creating new page in: {database_name}")
     print("=" * 50)
     
-    # Get property options
-    property_options = get_database_property_options(notion_client, database_id)
+    # A pasted JSON object fills every property at once
+    try:
+        pasted = input("Paste a JSON object of {property: value}, or press Enter for guided input: ").strip()
+    except KeyboardInterrupt:
+        print("\n❌ Page creation cancelled.")
+        return None
+    
+    if pasted.startswith("{"):
+        try:
+            values = json_loads(pasted)
+        except ValueError as e:
+            print(f"❌ Invalid JSON: {e}")
+            return None
+        return create_page_from_dict(notion_client, database_id, values, property_options)
     
     # Collect input for each property
     page_properties = {}
@@ -635,7 +1183,10 @@ def interactive_create_page(notion_client, database_id, database_name):
         prop_type = prop_info["type"]
         options = prop_info.get("options")
         
-        value = collect_property_input(prop_name, prop_type, options)
+        value = collect_property_input(
+            prop_name, prop_type, options,
+            prop_options_set=prop_info.get("options_set"), prompt_hint=prop_info.get("prompt_hint")
+        )
         
         if value is not None:
             notion_property = create_notion_property_value(prop_type, value)
@@ -654,65 +1205,74 @@ def interactive_create_page(notion_client, database_id, database_name):
     confirm = input(f"\n✅ Create this page? (y/n): ").lower().strip()
     
     if confirm in ['y', 'yes']:
-        try:
-            new_page = notion_client.pages.create(
-                parent={"database_id": database_id},
-                properties=page_properties
-            )
-            print(f"🎉 Successfully created page!")
-            print(f"📄 Page ID: {new_page['id']}")
-            print(f"🔗 URL: {new_page['url']}")
-            return new_page
-            
-        except Exception as e:
-            print(f"❌ Error creating page: {e}")
-            return None
+        return _create_page(notion_client, database_id, property_options, page_properties)
     else:
         print("❌ Page creation cancelled.")
         return None
 
-def interactive_edit_page(notion_client, database_id, database_name, database_data):
-    """Interactive page editing"""
-    if not database_data:
-        print("❌ No pages found in this database.")
-        return None
+def interactive_edit_page(notion_client, database_id, database_name, property_options, cursor_state=None):
+    """
+    Interactive page editing
+    
+    Pages are listed 10 at a time straight from databases.query, so the database
+    never has to be loaded in full just to pick one row.
     
+    Args:
+        property_options: Output of get_database_property_options
+        cursor_state: start_cursor of the first listing page (None for the beginning)
+    """
     print(f"\n✏️  Edit page in: {database_name}")
     print("=" * 50)
     
-    # Show existing pages
-    for i, page in enumerate(database_data[:10], 1):  # Show first 10 pages
-        title = "Untitled"
-        # Try to find a title-like property
-        for prop_name, value in page.items():
-            if prop_name.lower() in ['name', 'title', 'task', 'item'] and value:
-                title = str(value)[:50]
-                break
-        
-        print(f"{i}. {title}")
-    
-    if len(database_data) > 10:
-        print(f"... and {len(database_data) - 10} more pages")
+    title_prop = next((name for name, info in property_options.items() if info["type"] == "title"), None)
     
-    while True:
+    selected_page = None
+    while selected_page is None:
+        query_params = {"database_id": database_id, "page_size": 10}
+        if cursor_state:
+            query_params["start_cursor"] = cursor_state
         try:
-            choice = input(f"\nSelect page to edit (1-{min(10, len(database_data))}): ").strip()
-            choice_idx = int(choice) - 1
-            
-            if 0 <= choice_idx < min(10, len(database_data)):
-                selected_page = database_data[choice_idx]
-                break
-            else:
-                print(f"❌ Please enter a number between 1 and {min(10, len(database_data))}")
-        except ValueError:
-            print("❌ Please enter a valid number")
-        except KeyboardInterrupt:
-            print("\n❌ Edit cancelled.")
+            response = notion_client.databases.query(**query_params)
+        except Exception as e:
+            print(f"❌ Error querying pages: {e}")
+            return None
+        
+        pages = response["results"]
+        if not pages:
+            print("❌ No pages found in this database.")
             return None
+        
+        # Show this batch of pages
+        for i, page in enumerate(pages, 1):
+            title = "Untitled"
+            if title_prop and title_prop in page["properties"]:
+                title = extract_property_value(page["properties"][title_prop])[:50] or title
+            print(f"{i}. {title}")
+        
+        has_more = response.get("has_more")
+        prompt = f"\nSelect page to edit (1-{len(pages)}"
+        prompt += ", or 'n' for next page): " if has_more else "): "
+        
+        while True:
+            try:
+                choice = input(prompt).strip().lower()
+                if choice == "n" and has_more:
+                    cursor_state = response["next_cursor"]
+                    break
+                choice_idx = int(choice) - 1
+                
+                if 0 <= choice_idx < len(pages):
+                    selected_page = _flatten_page(pages[choice_idx])
+                    break
+                else:
+                    print(f"❌ Please enter a number between 1 and {len(pages)}")
+            except ValueError:
+                print("❌ Please enter a valid number")
+            except KeyboardInterrupt:
+                print("\n❌ Edit cancelled.")
+                return None
     
-    # Get current page details and property options
     page_id = selected_page['notion_id']
-    property_options = get_database_property_options(notion_client, database_id)
     
     print(f"\n📄 Editing page: {page_id}")
     print("Current values:")
@@ -728,9 +1288,13 @@ def interactive_edit_page(notion_client, database_id, database_name, database_da
         options = prop_info.get("options")
         current_value = selected_page.get(prop_name)
         
-        value = collect_property_input(prop_name, prop_type, options, current_value)
+        value = collect_property_input(
+            prop_name, prop_type, options, current_value,
+            prop_info.get("options_set"), prop_info.get("prompt_hint")
+        )
         
-        if value is not None:
+        # Values equal to the current ones are left out of the update
+        if value is not None and value is not _UNCHANGED:
             notion_property = create_notion_property_value(prop_type, value)
             if notion_property:
                 updates[prop_name] = notion_property
@@ -752,6 +1316,8 @@ def interactive_edit_page(notion_client, database_id, database_name, database_da
                 page_id=page_id,
                 properties=updates
             )
+            if _adds_schema_options(property_options, updates):
+                invalidate_schema(database_id)
             print(f"🎉 Successfully updated page!")
             return updated_page
             
@@ -763,6 +1329,17 @@ def interactive_edit_page(notion_client, database_id, database_name, database_da
         return None
     
 
+def _patch_row(rows, database_id, page):
+    """Replace the row of a created/updated page in place (or append it) and update the cache"""
+    row = _flatten_page(page)
+    for i, existing in enumerate(rows):
+        if existing["notion_id"] == row["notion_id"]:
+            rows[i] = row
+            break
+    else:
+        rows.append(row)
+    _store_pages(database_id, [row])
+
 def interactive_notion_manager(notion_client, database_ids, all_data):
     """
     Main interactive function for managing Notion databases
@@ -783,21 +1360,30 @@ def interactive_notion_manager(notion_client, database_ids, all_data):
             if not db_name:  # User cancelled or error
                 break
             
+            # Share the list with all_data so patched rows show up in later actions
+            db_data = all_data.setdefault(db_name, db_data)
+            
+            # One schema lookup per selected database, shared by every action
+            property_options = get_database_property_options(notion_client, db_id)
+            
             while True:
                 # Step 2: Select action
                 action = interactive_action_selector()
                 
                 if action == 1:  # Create new page
-                    new_page = interactive_create_page(notion_client, db_id, db_name)
+                    new_page = interactive_create_page(notion_client, db_id, db_name, property_options)
                     if new_page:
-                        # Refresh data to include new page
-                        all_data[db_name] = extract_all_database_data( {db_name: db_id})[db_name] # type: ignore
+                        # pages.create returns the full page; add it without re-querying the database
+                        _patch_row(db_data, db_id, new_page)
+                        # Picks up new select options if the page invalidated the schema
+                        property_options = get_database_property_options(notion_client, db_id)
                         
                 elif action == 2:  # Edit existing page
-                    updated_page = interactive_edit_page(notion_client, db_id, db_name, db_data)
+                    updated_page = interactive_edit_page(notion_client, db_id, db_name, property_options)
                     if updated_page:
-                        # Refresh data to show updates
-                        all_data[db_name] = extract_all_database_data({db_name: db_id})[db_name] # type: ignore
+                        # pages.update returns the full page; replace its row in place
+                        _patch_row(db_data, db_id, updated_page)
+                        property_options = get_database_property_options(notion_client, db_id)
                         
                 elif action == 3:  # View page details
                     if db_data:
@@ -816,24 +1402,27 @@ def interactive_notion_manager(notion_client, database_ids, all_data):
             break
 
 # Complete workflow with interactive management
-def complete_interactive_workflow():
-    """Complete workflow with interactive database management"""
+def complete_interactive_workflow(refresh=False):
+    """Complete workflow with interactive database management (refresh=True ignores the cache)"""
     # Initialize
     __init__client()
     notion = Client(auth=api_key)    
     # Load databases and data
     print("🔍 Loading Notion workspace...")
-    database_ids = get_notion_databases() # type: ignore
+    database_ids = get_notion_databases(use_cache=not refresh) # type: ignore
     
     if not database_ids:
         print("❌ No databases found!")
         return
     
-    all_data = extract_all_database_data(database_ids)
+    # Warm the schema cache so create/edit actions don't wait on databases.retrieve
+    prefetch_all_schemas(notion, database_ids)
+    all_data = extract_all_database_data(database_ids, use_cache=not refresh)
     
     # Start interactive manager
     interactive_notion_manager(notion, database_ids, all_data)
 
 # Run it!
 if __name__ == "__main__":
-    complete_interactive_workflow()
\ No newline at end of file
+    # python minitests.py --refresh bypasses the cache and refetches everything
+    complete_interactive_workflow(refresh="--refresh" in sys.argv)
\ No newline at end of file
@@ -0,0 +1,53 @@
+"""
+JSON helpers backed by the fastest library available: orjson, then ujson, then the stdlib.
+
+    loads(data)                               -> object (accepts str or bytes)
+    dumps(obj, indent=False, default=None)    -> str
+    dumpb(obj, indent=False, default=None)    -> bytes (UTF-8)
+
+indent=True means 2-space indentation, the only width orjson supports.
+"""
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+if orjson is None:
+    try:
+        import ujson
+    except ImportError:
+        ujson = None
+
+if orjson is not None:
+    BACKEND = "orjson"
+    loads = orjson.loads
+
+    def dumpb(obj, indent=False, default=None):
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else None, default=default)
+
+    def dumps(obj, indent=False, default=None):
+        return dumpb(obj, indent, default).decode()
+
+elif ujson is not None:
+    BACKEND = "ujson"
+    loads = ujson.loads
+
+    def dumps(obj, indent=False, default=None):
+        return ujson.dumps(obj, indent=2 if indent else 0, default=default, ensure_ascii=False)
+
+    def dumpb(obj, indent=False, default=None):
+        return dumps(obj, indent, default).encode()
+
+else:
+    import json
+
+    BACKEND = "json"
+    loads = json.loads
+
+    def dumps(obj, indent=False, default=None):
+        if indent:
+            return json.dumps(obj, indent=2, default=default, ensure_ascii=False)
+        return json.dumps(obj, separators=(",", ":"), default=default, ensure_ascii=False)
+
+    def dumpb(obj, indent=False, default=None):
+        return dumps(obj, indent, default).encode()